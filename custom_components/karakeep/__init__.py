@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import timedelta
 from homeassistant.config_entries import ConfigEntry
@@ -9,8 +10,18 @@ from homeassistant.helpers.update_coordinator import (
     UpdateFailed,
 )
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.const import CONF_URL, CONF_TOKEN
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, CONF_SCAN_INTERVAL, PLATFORMS
+from .const import (
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    HEALTH_SCAN_INTERVAL,
+    PLATFORMS,
+    STAT_KEYS,
+    HealthData,
+    StatsData,
+)
 from .api import KarakeepClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -32,42 +43,86 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     _LOGGER.debug("Creating Karakeep client with timeout: %s seconds", scan_interval)
     client = KarakeepClient(entry.data[CONF_URL], entry.data[CONF_TOKEN], session)
 
-    async def async_update_data():
-        """Fetch data from Karakeep API."""
-        _LOGGER.debug("Starting data update from Karakeep API")
+    async def async_update_stats() -> StatsData:
+        """Fetch stats from Karakeep API."""
+        _LOGGER.debug("Starting stats update from Karakeep API")
         try:
-            # Fetch stats
             data = await client.async_get_stats()
-            _LOGGER.debug("Stats update successful, received %d data points", len(data) if data else 0)
-            
-            # Fetch health status
-            health_data = await client.async_get_health()
-            data["health"] = health_data
-            _LOGGER.debug("Health check successful: %s", health_data)
-            
-            return data
+            # Always return every key so sensors can subscript directly
+            stats: StatsData = {key: data.get(key) for key in STAT_KEYS}
         except Exception as err:
-            _LOGGER.debug("Data update failed: %s", str(err))
+            _LOGGER.debug("Stats update failed: %s", err)
             raise UpdateFailed(err) from err
+        _LOGGER.debug("Stats update successful: %s", stats)
+        return stats
+
+    async def async_update_health() -> HealthData:
+        """Fetch health status from Karakeep API."""
+        # Failures are reported as a status dict rather than raised
+        health_data = await client.async_get_health()
+        status_code = health_data.get("status_code", 0)
+        status = str(health_data.get("status", "unknown"))
+        # Normalize once so the binary sensor only reads a flag
+        health: HealthData = {
+            "status_code": status_code,
+            "status": status,
+            "is_problem": status_code != 200 or status.strip().lower() != "ok",
+        }
+        _LOGGER.debug("Health check completed: %s", health)
+        return health
+
+    health_interval = min(HEALTH_SCAN_INTERVAL, scan_interval)
     _LOGGER.debug(
-        "Creating DataUpdateCoordinator with update interval: %s seconds",
-        scan_interval
+        "Creating DataUpdateCoordinators with update intervals: stats=%s, health=%s seconds",
+        scan_interval,
+        health_interval,
     )
-    coordinator = DataUpdateCoordinator(
+    # Stats rarely change, so skip entity state writes when the data is equal
+    stats_coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
-        name=DOMAIN,
+        name=f"{DOMAIN}_stats",
         update_interval=timedelta(seconds=scan_interval),
-        update_method=async_update_data,
-        config_entry=entry
+        update_method=async_update_stats,
+        config_entry=entry,
+        always_update=False,
+    )
+    # The cheap health endpoint is polled more often to surface problems early
+    health_coordinator = DataUpdateCoordinator(
+        hass,
+        _LOGGER,
+        name=f"{DOMAIN}_health",
+        update_interval=timedelta(seconds=health_interval),
+        update_method=async_update_health,
+        config_entry=entry,
+        always_update=False,
     )
 
     _LOGGER.debug("Performing initial data refresh")
-    await coordinator.async_config_entry_first_refresh()
+    await asyncio.gather(
+        stats_coordinator.async_config_entry_first_refresh(),
+        health_coordinator.async_config_entry_first_refresh(),
+    )
     _LOGGER.debug("Initial data refresh completed")
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
-    _LOGGER.debug("Stored coordinator in hass.data[%s][%s]", DOMAIN, entry.entry_id)
+    # Keep the client alongside the coordinators so every refresh reuses it
+    # (and the keep-alive connections of the shared aiohttp session).
+    # The connection settings are kept to tell option-only updates apart.
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "client": client,
+        "stats": stats_coordinator,
+        "health": health_coordinator,
+        # Shared by every entity of this entry
+        "device_info": DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Karakeep",
+            manufacturer="Karakeep",
+            entry_type=DeviceEntryType.SERVICE,
+        ),
+        "url": entry.data[CONF_URL],
+        "token": entry.data[CONF_TOKEN],
+    }
+    _LOGGER.debug("Stored client and coordinators in hass.data[%s][%s]", DOMAIN, entry.entry_id)
     
     _LOGGER.debug("Setting up platform entities: %s", PLATFORMS)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -83,7 +138,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     
     if unload_ok:
         _LOGGER.debug("Successfully unloaded platforms, removing entry data")
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["client"].async_close()
         _LOGGER.debug("Karakeep integration unloaded successfully")
     else:
         _LOGGER.warning("Failed to unload all platforms for Karakeep integration")
@@ -92,5 +148,32 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
 
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update options.
+
+    A scan interval change is applied to the running coordinators and takes
+    effect right away; only a new URL or token requires reloading the entry.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    if (
+        entry.data[CONF_URL] != entry_data["url"]
+        or entry.data[CONF_TOKEN] != entry_data["token"]
+    ):
+        _LOGGER.debug("Connection settings changed, reloading entry %s", entry.entry_id)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    scan_interval = entry.options.get(
+        CONF_SCAN_INTERVAL,
+        entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+    _LOGGER.debug("Updating stats update interval to %s seconds", scan_interval)
+    entry_data["stats"].update_interval = timedelta(seconds=scan_interval)
+    entry_data["health"].update_interval = timedelta(
+        seconds=min(HEALTH_SCAN_INTERVAL, scan_interval)
+    )
+    # Setting update_interval does not move the already scheduled refresh;
+    # refreshing now reschedules the next one on the new interval
+    await asyncio.gather(
+        entry_data["stats"].async_request_refresh(),
+        entry_data["health"].async_request_refresh(),
+    )
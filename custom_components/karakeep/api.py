@@ -1,38 +1,84 @@
 from __future__ import annotations
+import asyncio
 import logging
+import random
 from aiohttp import (
+    ClientResponse,
     ClientSession,
     ClientTimeout,
     ClientError,
     ClientResponseError,
     ClientConnectorError,
-    ContentTypeError,
     ServerTimeoutError
 )
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson ships with Home Assistant
+    from json import loads as _json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
+# Status codes worth retrying; anything else (401, 403, 404, ...) fails fast
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Status codes whose Retry-After header is honored
+_RETRY_AFTER_STATUSES = {429, 503}
+_MAX_RETRY_DELAY = 30.0
+# Seconds allowed for establishing a connection, within the total timeout
+_CONNECT_TIMEOUT = 5
+# Largest response body accepted from the API
+_MAX_RESPONSE_BYTES = 1024 * 1024
+
 class KarakeepClient:
+    """Client for the Karakeep REST API.
+
+    Response bodies larger than 1 MiB are rejected with ValueError so a
+    misbehaving server cannot exhaust memory.
+    """
+
     def __init__(
         self,
         base_url: str,
         token: str,
         session: ClientSession,
-        timeout: Optional[int] = 15
+        timeout: Optional[int] = 15,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        jitter: float = 0.5,
     ):
         """Initialize the Karakeep API client.
         
         Args:
             base_url: Base URL of the Karakeep API
             token: Authentication token
-            session: aiohttp ClientSession
-            timeout: Request timeout in seconds (default: 15)
+            session: aiohttp ClientSession. Callers pass Home Assistant's
+                shared session, whose connector keeps connections alive, so
+                no dedicated connector is created here.
+            timeout: Request timeout in seconds (default: 15); connecting is
+                limited to 5 seconds of it
+            max_retries: Attempts made for transient failures (default: 3)
+            base_delay: Initial backoff delay in seconds (default: 1.0)
+            jitter: Random fraction added to each backoff delay (default: 0.5)
         """
         self._url = base_url.rstrip("/")
-        self._token = token
+        # Built once and shared by every request
+        self._headers = {"Authorization": f"Bearer {token}"}
         self._session = session
-        self._timeout = ClientTimeout(total=timeout)
+        # Built once; a short connect timeout lets an unreachable host fail
+        # fast enough for the retry loop to try again within one refresh
+        self._timeout = ClientTimeout(
+            total=timeout,
+            connect=min(_CONNECT_TIMEOUT, timeout) if timeout else _CONNECT_TIMEOUT,
+            sock_read=timeout,
+        )
+        self._max_retries = max(1, max_retries)
+        self._base_delay = base_delay
+        self._jitter = jitter
+        # Tasks of requests currently in flight, keyed by endpoint name
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Number of callers awaiting each in-flight task
+        self._waiters: dict[asyncio.Task, int] = {}
         
         _LOGGER.debug(
             "Initialized KarakeepClient with base URL: %s, timeout: %s seconds",
@@ -40,13 +86,83 @@ class KarakeepClient:
             timeout
         )
 
-    @property
-    def _headers(self) -> dict[str, str]:
-        """Return headers for the request."""
-        return {"Authorization": f"Bearer {self._token}"}
+    def _retry_delay(
+        self, attempt: int, err: ClientResponseError | None = None
+    ) -> float:
+        """Return the delay before the next attempt, capped at 30 seconds."""
+        if err is not None and err.status in _RETRY_AFTER_STATUSES and err.headers:
+            try:
+                retry_after = float(err.headers.get("Retry-After", ""))
+                return min(max(retry_after, 0.0), _MAX_RETRY_DELAY)
+            except ValueError:
+                # Missing or HTTP-date Retry-After, fall back to backoff
+                pass
+        delay = self._base_delay * 2**attempt * (1 + random.random() * self._jitter)
+        return min(delay, _MAX_RETRY_DELAY)
+
+    async def _async_read_body(self, resp: ClientResponse) -> bytes:
+        """Read the response body, rejecting anything over the size cap."""
+        if resp.content_length is not None and resp.content_length > _MAX_RESPONSE_BYTES:
+            raise ValueError(
+                f"Response too large ({resp.content_length} bytes)"
+            )
+        body = bytearray()
+        async for chunk in resp.content.iter_chunked(65536):
+            body.extend(chunk)
+            if len(body) > _MAX_RESPONSE_BYTES:
+                raise ValueError(
+                    f"Response exceeds {_MAX_RESPONSE_BYTES} bytes"
+                )
+        return bytes(body)
+
+    async def _async_single_flight(
+        self, key: str, fetch: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Run fetch once and hand its result to every concurrent caller.
+
+        The fetch runs as its own task, so cancelling one caller does not
+        cancel it for the others; it is cancelled once no caller waits.
+        """
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            _LOGGER.debug("Joining in-flight Karakeep %s request", key)
+        else:
+            task = asyncio.get_running_loop().create_task(fetch())
+            self._inflight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(
+                lambda done: self._fetch_done(key, done)
+            )
+
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                # Last caller gone (finished or cancelled), nothing needs it
+                del self._waiters[task]
+                task.cancel()
+
+    def _fetch_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished fetch task."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled
+            task.exception()
+
+    async def async_close(self) -> None:
+        """Cancel requests still in flight, e.g. when the entry unloads."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def async_get_stats(self) -> dict[str, Any]:
         """Return /users/me/stats response.
+
+        Concurrent callers share a single in-flight request.
         
         Returns:
             Dictionary containing user statistics
@@ -54,110 +170,99 @@ class KarakeepClient:
         Raises:
             ClientResponseError: If the API returns an error status code
             ClientConnectorError: If connection to the API fails
-            ContentTypeError: If the response is not valid JSON
+            ValueError: If the response is not valid JSON
             ServerTimeoutError: If the API request times out
             ClientError: For other aiohttp client errors
             Exception: For any other unexpected errors
         """
+        return await self._async_single_flight("stats", self._async_fetch_stats)
+
+    async def _async_fetch_stats(self) -> dict[str, Any]:
+        """Fetch /users/me/stats, retrying transient failures."""
         endpoint = f"{self._url}/api/v1/users/me/stats"
         
         _LOGGER.debug("Sending GET request to Karakeep API: %s", endpoint)
 
         try:
-            async with self._session.get(
-                endpoint,
-                headers=self._headers,
-                timeout=self._timeout
-            ) as resp:
-                _LOGGER.debug(
-                    "Received response from Karakeep API with status: %s, content-type: %s",
-                    resp.status,
-                    resp.headers.get("content-type", "unknown")
-                )
+            for attempt in range(self._max_retries):
+                try:
+                    async with self._session.get(
+                        endpoint,
+                        headers=self._headers,
+                        timeout=self._timeout
+                    ) as resp:
+                        if _LOGGER.isEnabledFor(logging.DEBUG):
+                            _LOGGER.debug(
+                                "Received response from Karakeep API with status: %s, content-type: %s",
+                                resp.status,
+                                resp.headers.get("content-type", "unknown")
+                            )
                 
-                resp.raise_for_status()
-                _LOGGER.debug("Response status code is valid, parsing JSON response")
+                        resp.raise_for_status()
                 
-                data = await resp.json()
+                        data = _json_loads(await self._async_read_body(resp))
+                        _LOGGER.debug("Successfully retrieved stats from Karakeep API")
+                        return data
+
+                except ClientResponseError as err:
+                    if (
+                        err.status not in _RETRY_STATUSES
+                        or attempt == self._max_retries - 1
+                    ):
+                        raise
+                    delay = self._retry_delay(attempt, err)
+                except (ClientConnectorError, ServerTimeoutError, asyncio.TimeoutError):
+                    if attempt == self._max_retries - 1:
+                        raise
+                    delay = self._retry_delay(attempt)
+
                 _LOGGER.debug(
-                    "Successfully retrieved stats from Karakeep API, data keys: %s",
-                    ", ".join(data.keys()) if isinstance(data, dict) else "not a dictionary"
+                    "Transient error from Karakeep API, retrying in %.1f seconds (attempt %s of %s)",
+                    delay,
+                    attempt + 1,
+                    self._max_retries,
                 )
-                return data
-                
-        except ClientResponseError as err:
-            _LOGGER.debug(
-                "ClientResponseError details - Method: %s, URL: %s, Status: %s, Message: %s, Headers: %s",
-                err.request_info.method if hasattr(err, 'request_info') else "unknown",
-                err.request_info.url if hasattr(err, 'request_info') else "unknown",
-                err.status,
-                err.message,
-                err.headers if hasattr(err, 'headers') else "unknown"
-            )
-            _LOGGER.error(
-                "HTTP error when accessing Karakeep API: %s - %s",
-                err.status, err.message
-            )
-            raise
-            
-        except ClientConnectorError as err:
-            _LOGGER.debug(
-                "ClientConnectorError details - Host: %s, Port: %s, SSL: %s",
-                getattr(err, 'host', 'unknown'),
-                getattr(err, 'port', 'unknown'),
-                getattr(err, 'ssl', 'unknown')
-            )
-            _LOGGER.error(
-                "Connection error when accessing Karakeep API: %s",
-                str(err)
-            )
+                await asyncio.sleep(delay)
+
+        except ClientError as err:
+            _LOGGER.debug("Karakeep API error: %r", err)
+            if isinstance(err, ClientResponseError):
+                _LOGGER.error(
+                    "HTTP error when accessing Karakeep API: %s - %s",
+                    err.status, err.message
+                )
+            elif isinstance(err, ClientConnectorError):
+                _LOGGER.error("Connection error when accessing Karakeep API: %s", err)
+            elif isinstance(err, ServerTimeoutError):
+                _LOGGER.error(
+                    "Timeout when accessing Karakeep API (timeout=%s seconds): %s",
+                    self._timeout.total, err
+                )
+            else:
+                _LOGGER.error("Error accessing Karakeep API: %s", err)
             raise
-            
-        except ContentTypeError as err:
-            _LOGGER.debug(
-                "ContentTypeError details - Expected content type: application/json"
-            )
+
+        except asyncio.TimeoutError:
             _LOGGER.error(
-                "Invalid response format from Karakeep API: %s",
-                str(err)
-            )
-            raise
-            
-        except ServerTimeoutError as err:
-            _LOGGER.debug(
-                "ServerTimeoutError details - Timeout settings: %s seconds",
+                "Timeout when accessing Karakeep API (timeout=%s seconds)",
                 self._timeout.total
             )
-            _LOGGER.error(
-                "Timeout when accessing Karakeep API (timeout=%s seconds): %s",
-                self._timeout.total, str(err)
-            )
             raise
-            
-        except ClientError as err:
-            _LOGGER.debug(
-                "ClientError details - Type: %s",
-                type(err).__name__
-            )
-            _LOGGER.error(
-                "Error accessing Karakeep API: %s",
-                str(err)
-            )
+
+        except ValueError as err:
+            _LOGGER.error("Invalid response format from Karakeep API: %s", err)
             raise
-            
+
         except Exception as err:
-            _LOGGER.debug(
-                "Unexpected exception details - Type: %s",
-                type(err).__name__
-            )
             _LOGGER.exception(
-                "Unexpected error when accessing Karakeep API: %s",
-                str(err)
+                "Unexpected error when accessing Karakeep API: %s", err
             )
             raise
 
     async def async_get_health(self) -> dict[str, Any]:
         """Return /api/health response.
+
+        Concurrent callers share a single in-flight request.
         
         Returns:
             Dictionary containing health status information
@@ -165,11 +270,15 @@ class KarakeepClient:
         Raises:
             ClientResponseError: If the API returns an error status code
             ClientConnectorError: If connection to the API fails
-            ContentTypeError: If the response is not valid JSON
+            ValueError: If the response is not valid JSON
             ServerTimeoutError: If the API request times out
             ClientError: For other aiohttp client errors
             Exception: For any other unexpected errors
         """
+        return await self._async_single_flight("health", self._async_fetch_health)
+
+    async def _async_fetch_health(self) -> dict[str, Any]:
+        """Fetch /api/health, mapping failures to a status dict."""
         endpoint = f"{self._url}/api/health"
         
         _LOGGER.debug("Sending GET request to Karakeep health endpoint: %s", endpoint)
@@ -191,7 +300,7 @@ class KarakeepClient:
                 
                 # Try to parse JSON response
                 try:
-                    data = await resp.json()
+                    data = _json_loads(await self._async_read_body(resp))
                     data["status_code"] = status_code
                     _LOGGER.debug(
                         "Successfully retrieved health status from Karakeep API: %s",
@@ -213,26 +322,19 @@ class KarakeepClient:
             return {"status_code": err.status, "status": "error"}
             
         except ClientConnectorError as err:
-            _LOGGER.debug(
-                "ClientConnectorError during health check: %s",
-                str(err)
-            )
+            _LOGGER.debug("ClientConnectorError during health check: %r", err)
             # Return connection error status
             return {"status_code": 0, "status": "connection_error"}
             
         except ServerTimeoutError as err:
             _LOGGER.debug(
-                "ServerTimeoutError during health check (timeout=%s seconds): %s",
-                self._timeout.total, str(err)
+                "ServerTimeoutError during health check (timeout=%s seconds): %r",
+                self._timeout.total, err
             )
             # Return timeout status
             return {"status_code": 0, "status": "timeout"}
             
         except Exception as err:
-            _LOGGER.debug(
-                "Unexpected exception during health check - Type: %s: %s",
-                type(err).__name__,
-                str(err)
-            )
+            _LOGGER.debug("Unexpected exception during health check: %r", err)
             # Return generic error status
             return {"status_code": 0, "status": "error"}
@@ -7,10 +7,10 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.device_registry import DeviceInfo
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,22 +24,23 @@ async def async_setup_entry(
     """Set up Karakeep binary sensors based on a config entry."""
     _LOGGER.debug("Setting up Karakeep binary sensor entities for entry_id: %s", entry.entry_id)
 
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["health"]
     _LOGGER.debug(
-        "Retrieved coordinator from hass.data[%s][%s]",
+        "Retrieved health coordinator from hass.data[%s][%s]",
         DOMAIN,
         entry.entry_id,
     )
 
-    entities = [
-        KarakeepHealthSensor(
-            coordinator=coordinator,
-            entry_id=entry.entry_id,
-        )
-    ]
-
-    _LOGGER.debug("Adding %d Karakeep binary sensor entities", len(entities))
-    async_add_entities(entities)
+    async_add_entities(
+        [
+            KarakeepHealthSensor(
+                coordinator=coordinator,
+                entry_id=entry.entry_id,
+                device_info=entry_data["device_info"],
+            )
+        ]
+    )
     _LOGGER.debug("Karakeep binary sensor entities setup completed")
 
 
@@ -54,12 +55,14 @@ class KarakeepHealthSensor(CoordinatorEntity, BinarySensorEntity):
         self,
         coordinator,
         entry_id: str,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._entry_id = entry_id
+        self._attr_device_info = device_info
         self._attr_name = "Health"
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_health"
+        self._update_attrs()
 
         _LOGGER.debug(
             "Initialized KarakeepHealthSensor: entry_id=%s unique_id=%s",
@@ -67,41 +70,21 @@ class KarakeepHealthSensor(CoordinatorEntity, BinarySensorEntity):
             self._attr_unique_id,
         )
 
-    @property
-    def device_info(self) -> dict:
-        """Return device info to group entities under a service."""
-        return {
-            "identifiers": {(DOMAIN, self._entry_id)},
-            "name": "Karakeep",
-            "manufacturer": "Karakeep",
-            "entry_type": DeviceEntryType.SERVICE,
-        }
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Cache the new problem state, then write the state."""
+        self._update_attrs()
+        super()._handle_coordinator_update()
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if the health check indicates a problem."""
-        health_data = self.coordinator.data.get("health", {})
-        status_code = health_data.get("status_code", 0)
-        status = health_data.get("status", "unknown")
-        
-        _LOGGER.debug(
-            "Health check for sensor %s: status_code=%s, status=%s",
-            self._attr_unique_id,
-            status_code,
-            status,
-        )
-        
-        # Return True if there's a problem (not 200 OK)
+    def _update_attrs(self) -> None:
+        """Compute the problem state from the latest health data."""
         # Binary sensor with PROBLEM class: True = problem detected, False = no problem
-        is_problem = status_code != 200 or status.lower() != "ok"
-        
+        self._attr_is_on = self.coordinator.data["is_problem"]
         _LOGGER.debug(
             "Health sensor %s problem state: %s",
             self._attr_unique_id,
-            is_problem,
+            self._attr_is_on,
         )
-        
-        return is_problem
 
     @property
     def available(self) -> bool:
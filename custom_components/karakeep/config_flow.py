@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 import voluptuous as vol
-from urllib.parse import urlparse
 
-from aiohttp import ClientError, ClientResponseError, ClientConnectorError, ClientTimeout, InvalidURL
+from aiohttp import ClientError, ClientResponseError, ClientConnectorError, InvalidURL
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_URL, CONF_TOKEN
@@ -17,6 +18,23 @@ from .api import KarakeepClient
 
 _LOGGER = logging.getLogger(__name__)
 
+# Scheme plus a non-empty host is all we require of a base URL
+_URL_RE = re.compile(r"^https?://[^/\s]+", re.IGNORECASE)
+# Karakeep API keys are far longer; anything shorter cannot authenticate
+_MIN_TOKEN_LENGTH = 10
+
+# Form error keys for HTTP statuses and client errors seen while validating;
+# anything else maps to "api_error" / "client_error"
+_STATUS_ERRORS = {401: "invalid_auth", 404: "invalid_api_path"}
+_CLIENT_ERRORS = {
+    ClientConnectorError: "cannot_connect",
+    InvalidURL: "invalid_url",
+}
+
+# Shared by the user and options forms; defaults differ per entry, so only
+# the validator is built once
+_SCAN_INTERVAL_VALIDATOR = vol.All(cv.positive_int, vol.Range(min=30))
+
 
 class KarakeepConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle Karakeep config flow and reconfiguration."""
@@ -39,24 +57,27 @@ class KarakeepConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         Exposed via the UI (Reconfigure menu) to update URL/token/scan_interval.
         """
         _LOGGER.debug("Starting Karakeep config flow - reconfigure step")
-        if not self._async_current_entries():
+        entries = self._async_current_entries()
+        if not entries:
             _LOGGER.debug("Reconfigure requested but no existing entries found, aborting")
             return self.async_abort(reason="no_existing_config")
 
         # For now we assume a single entry; if multiple are ever supported,
         # Home Assistant will pass the correct entry_id context.
-        entry = self._async_current_entries()[0]
-        return await self._async_handle_config_step("reconfigure", user_input, entry)
+        return await self._async_handle_config_step(
+            "reconfigure", user_input, entries[0], entries
+        )
 
     async def _async_handle_config_step(
         self,
         step_id: str,
         user_input,
         existing_entry: config_entries.ConfigEntry | None = None,
+        current_entries: list[config_entries.ConfigEntry] | None = None,
     ) -> FlowResult:
         """Shared handler for initial setup and reconfiguration.
 
-        - Validates URL format.
+        - Validates URL format and token length.
         - Tests connectivity & auth.
         - For 'user': creates new entry.
         - For 'reconfigure': updates existing config entry.
@@ -69,157 +90,154 @@ class KarakeepConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if step_id == "user":
                 scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
                 _LOGGER.debug(
                     "Processing %s step input: url=%s, token_len=%s, scan_interval=%s",
                     step_id,
                     url,
-                    len(token) if token else 0,
-                    scan_interval,
-                )
-            else:
-                _LOGGER.debug(
-                    "Processing %s step input: url=%s, token_len=%s",
-                    step_id,
-                    url,
-                    len(token) if token else 0,
+                    len(token),
+                    scan_interval if step_id == "user" else "unchanged",
                 )
 
             # Validate URL
-            try:
-                parsed = urlparse(url)
-                _LOGGER.debug(
-                    "URL parse result - scheme=%s, netloc=%s, path=%s",
-                    parsed.scheme,
-                    parsed.netloc,
-                    parsed.path,
+            if not _URL_RE.match(url):
+                _LOGGER.error(
+                    "Invalid URL format for %s step: %s", step_id, url
                 )
+                errors["base"] = "invalid_url_format"
+            elif len(token) < _MIN_TOKEN_LENGTH:
+                # Reject obviously bad tokens without a round-trip
+                _LOGGER.error("Invalid API token for %s step", step_id)
+                errors["base"] = "invalid_auth"
+            else:
+                # Normalize URL (without trailing slash)
+                normalized_url = url.rstrip("/")
+
+                # Prevent duplicate configuration for the same URL before
+                # spending a round-trip on validation
+                if current_entries is None:
+                    current_entries = self._async_current_entries()
+                for existing in current_entries:
+                    if (
+                        existing_entry is None
+                        or existing.entry_id != existing_entry.entry_id
+                    ) and existing.data.get(CONF_URL) == normalized_url:
+                        _LOGGER.debug(
+                            "Found existing Karakeep entry (%s) with same URL=%s; aborting",
+                            existing.entry_id,
+                            normalized_url,
+                        )
+                        return self.async_abort(reason="already_configured")
 
-                if parsed.scheme not in ("http", "https") or not parsed.netloc:
-                    _LOGGER.error(
-                        "Invalid URL format for %s step: %s", step_id, url
-                    )
-                    errors["base"] = "invalid_url_format"
-                else:
-                    # Normalize URL (without trailing slash)
-                    normalized_url = url.rstrip("/")
-                    session = async_get_clientsession(self.hass)
-                    client = KarakeepClient(normalized_url, token, session)
-
-                    try:
+                # Only hit the API when the connection settings changed
+                url_changed = (
+                    existing_entry is None
+                    or existing_entry.data.get(CONF_URL) != normalized_url
+                )
+                token_changed = (
+                    existing_entry is None
+                    or existing_entry.data.get(CONF_TOKEN) != token
+                )
+
+                try:
+                    if url_changed or token_changed:
                         _LOGGER.debug(
                             "Testing connection to Karakeep API at %s (%s step)",
                             normalized_url,
                             step_id,
                         )
+                        session = async_get_clientsession(self.hass)
+                        # Report failures right away instead of retrying
+                        # while the form waits
+                        client = KarakeepClient(
+                            normalized_url, token, session, max_retries=1
+                        )
                         await client.async_get_stats()
                         _LOGGER.info(
                             "Successfully validated Karakeep configuration (%s step)",
                             step_id,
                         )
+                    else:
+                        _LOGGER.debug(
+                            "URL and token unchanged (%s step), skipping validation",
+                            step_id,
+                        )
 
-                        data = {
-                            CONF_URL: normalized_url,
-                            CONF_TOKEN: token,
-                        }
-                        if step_id == "user":
-                            data[CONF_SCAN_INTERVAL] = scan_interval
-
-                        # Prevent duplicate configuration for the same URL when creating
-                        for existing in self._async_current_entries():
-                            if (
-                                existing_entry is None
-                                or existing.entry_id != existing_entry.entry_id
-                            ) and existing.data.get(CONF_URL) == normalized_url:
-                                _LOGGER.debug(
-                                    "Found existing Karakeep entry (%s) with same URL=%s; aborting",
-                                    existing.entry_id,
-                                    normalized_url,
-                                )
-                                return self.async_abort(reason="already_configured")
-
-                        if step_id == "reconfigure" and existing_entry is not None:
-                            _LOGGER.debug(
-                                "Updating existing Karakeep entry_id=%s with new data",
-                                existing_entry.entry_id,
-                            )
-                            # Preserve existing scan_interval in data if present
-                            if CONF_SCAN_INTERVAL in existing_entry.data:
-                                data[CONF_SCAN_INTERVAL] = existing_entry.data[CONF_SCAN_INTERVAL]
-
-                            self.hass.config_entries.async_update_entry(
-                                existing_entry,
-                                data=data,
-                            )
-                            return self.async_abort(reason="reconfigure_successful")
+                    data = {
+                        CONF_URL: normalized_url,
+                        CONF_TOKEN: token,
+                    }
+                    if step_id == "user":
+                        data[CONF_SCAN_INTERVAL] = scan_interval
 
+                    if step_id == "reconfigure" and existing_entry is not None:
                         _LOGGER.debug(
-                            "Creating new Karakeep config entry (user step)"
+                            "Updating existing Karakeep entry_id=%s with new data",
+                            existing_entry.entry_id,
                         )
-                        return self.async_create_entry(
-                            title="Karakeep",
+                        # Preserve existing scan_interval in data if present
+                        if CONF_SCAN_INTERVAL in existing_entry.data:
+                            data[CONF_SCAN_INTERVAL] = existing_entry.data[CONF_SCAN_INTERVAL]
+
+                        self.hass.config_entries.async_update_entry(
+                            existing_entry,
                             data=data,
                         )
+                        return self.async_abort(reason="reconfigure_successful")
 
-                    except ClientConnectorError as err:
-                        _LOGGER.debug("Connection error details: %s", err)
-                        _LOGGER.error("Connection error during %s step: %s", step_id, err)
-                        errors["base"] = "cannot_connect"
-                    except ClientResponseError as err:
-                        _LOGGER.debug(
-                            "Response error details - Status: %s, Message: %s",
-                            err.status,
-                            err.message,
-                        )
-                        _LOGGER.error(
-                            "Invalid response from API during %s step: %s",
-                            step_id,
-                            err,
-                        )
-                        if err.status == 401:
-                            errors["base"] = "invalid_auth"
-                        elif err.status == 404:
-                            errors["base"] = "invalid_api_path"
-                        else:
-                            errors["base"] = "api_error"
-                    except ClientTimeout as err:
-                        _LOGGER.debug("Timeout error details: %s", err)
-                        _LOGGER.error(
-                            "Timeout connecting to API during %s step", step_id
-                        )
-                        errors["base"] = "timeout_error"
-                    except ClientError as err:
-                        _LOGGER.debug(
-                            "Client error type: %s, details: %s",
-                            type(err).__name__,
-                            err,
-                        )
-                        _LOGGER.error(
-                            "Client error during %s step: %s", step_id, err
-                        )
-                        errors["base"] = "client_error"
-                    except InvalidURL as err:
-                        _LOGGER.debug("Invalid URL error details: %s", err)
-                        _LOGGER.error(
-                            "Invalid URL during %s step: %s", step_id, err
-                        )
-                        errors["base"] = "invalid_url"
-                    except Exception as err:  # noqa: BLE001
-                        _LOGGER.debug(
-                            "Unexpected error type during %s step: %s",
-                            step_id,
-                            type(err).__name__,
-                        )
-                        _LOGGER.exception(
-                            "Unexpected error during %s step: %s", step_id, err
-                        )
-                        errors["base"] = "unknown"
+                    _LOGGER.debug(
+                        "Creating new Karakeep config entry (user step)"
+                    )
+                    return self.async_create_entry(
+                        title="Karakeep",
+                        data=data,
+                    )
 
-            except ValueError as err:
-                _LOGGER.debug("URL parsing ValueError details: %s", err)
-                _LOGGER.error(
-                    "URL parsing error for %s step with url=%s", step_id, url
-                )
-                errors["base"] = "invalid_url_format"
+                except ClientResponseError as err:
+                    _LOGGER.error(
+                        "Invalid response from API during %s step: %s",
+                        step_id,
+                        err,
+                    )
+                    errors["base"] = _STATUS_ERRORS.get(err.status, "api_error")
+                except asyncio.TimeoutError:
+                    _LOGGER.error(
+                        "Timeout connecting to API during %s step", step_id
+                    )
+                    errors["base"] = "timeout_error"
+                except ClientError as err:
+                    _LOGGER.error(
+                        "Client error during %s step (%s): %s",
+                        step_id,
+                        type(err).__name__,
+                        err,
+                    )
+                    errors["base"] = next(
+                        (
+                            reason
+                            for exc_type, reason in _CLIENT_ERRORS.items()
+                            if isinstance(err, exc_type)
+                        ),
+                        "client_error",
+                    )
+                except ValueError as err:
+                    # Non-JSON or oversized body, e.g. a proxy page at a wrong URL
+                    _LOGGER.error(
+                        "Invalid response from API during %s step: %s",
+                        step_id,
+                        err,
+                    )
+                    errors["base"] = "api_error"
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.debug(
+                        "Unexpected error type during %s step: %s",
+                        step_id,
+                        type(err).__name__,
+                    )
+                    _LOGGER.exception(
+                        "Unexpected error during %s step: %s", step_id, err
+                    )
+                    errors["base"] = "unknown"
 
         # Build schema with defaults (for reconfigure use existing values)
         if existing_entry is not None:
@@ -234,14 +252,15 @@ class KarakeepConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             default_token = ""
             default_interval = DEFAULT_SCAN_INTERVAL
 
-        _LOGGER.debug(
-            "Showing %s form with defaults: url=%s, token_len=%s, scan_interval=%s; errors=%s",
-            step_id,
-            default_url,
-            len(default_token) if default_token else 0,
-            default_interval,
-            errors,
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Showing %s form with defaults: url=%s, token_len=%s, scan_interval=%s; errors=%s",
+                step_id,
+                default_url,
+                len(default_token),
+                default_interval,
+                errors,
+            )
 
         schema_dict = {
             vol.Required(CONF_URL, default=default_url): str,
@@ -251,7 +270,7 @@ class KarakeepConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             schema_dict[vol.Optional(
                 CONF_SCAN_INTERVAL,
                 default=default_interval,
-            )] = vol.All(cv.positive_int, vol.Range(min=30))
+            )] = _SCAN_INTERVAL_VALIDATOR
 
         schema = vol.Schema(schema_dict)
 
@@ -285,7 +304,7 @@ class KarakeepOptionsFlow(config_entries.OptionsFlow):
             vol.Optional(
                 CONF_SCAN_INTERVAL,
                 default=current_scan_interval,
-            ): vol.All(cv.positive_int, vol.Range(min=30))
+            ): _SCAN_INTERVAL_VALIDATOR
         }
 
         _LOGGER.debug("Creating options form schema")
@@ -1,5 +1,34 @@
+from __future__ import annotations
+
+from typing import TypedDict
+
 DOMAIN = "karakeep"
 
 DEFAULT_SCAN_INTERVAL = 300  # seconds
+HEALTH_SCAN_INTERVAL = 60  # seconds, capped at the configured scan interval
 CONF_SCAN_INTERVAL = "scan_interval"
 PLATFORMS = ["sensor", "binary_sensor"]
+
+# Stats read from /users/me/stats, one sensor each: (name, icon, unit)
+STATS = {
+    "numBookmarks":  ("Bookmarks", "bookmark", "bookmarks"),
+    "numFavorites":  ("Favorites", "star", "favorites"),
+    "numArchived":   ("Archived", "archive", "items"),
+    "numHighlights": ("Highlights", "marker", "highlights"),
+    "numLists":      ("Lists", "format-list-bulleted", "lists"),
+    "numTags":       ("Tags", "tag", "tags"),
+}
+STAT_KEYS = tuple(STATS)
+
+# Stats coordinator data: every STAT_KEYS entry mapped to its count, or None
+# when the server omits it. Deliberately not a TypedDict, which would list
+# the keys a second time next to STATS
+StatsData = dict[str, int | None]
+
+
+class HealthData(TypedDict):
+    """Health coordinator data; every key is always present."""
+
+    status_code: int
+    status: str
+    is_problem: bool
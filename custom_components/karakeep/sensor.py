@@ -3,22 +3,24 @@ from __future__ import annotations
 import logging
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.device_registry import DeviceEntryType
-from .const import DOMAIN
+from homeassistant.helpers.device_registry import DeviceInfo
+from .const import DOMAIN, STATS
 
 _LOGGER = logging.getLogger(__name__)
 
-STATS = {
-    "numBookmarks":  ("Bookmarks", "bookmark", "bookmarks"),
-    "numFavorites":  ("Favorites", "star", "favorites"),
-    "numArchived":   ("Archived", "archive", "items"),
-    "numHighlights": ("Highlights", "marker", "highlights"),
-    "numLists":      ("Lists", "format-list-bulleted", "lists"),
-    "numTags":       ("Tags", "tag", "tags"),
+# Descriptions are static, so build them once at import
+ENTITY_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+    key: SensorEntityDescription(
+        key=key,
+        name=name,
+        icon=f"mdi:{icon}",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=unit,
+    )
+    for key, (name, icon, unit) in STATS.items()
 }
 
 async def async_setup_entry(
@@ -29,34 +31,28 @@ async def async_setup_entry(
     """Set up Karakeep sensors based on a config entry."""
     _LOGGER.debug("Setting up Karakeep sensor entities for entry_id: %s", entry.entry_id)
 
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["stats"]
     _LOGGER.debug(
-        "Retrieved coordinator from hass.data[%s][%s]",
+        "Retrieved stats coordinator from hass.data[%s][%s]",
         DOMAIN,
         entry.entry_id,
     )
 
-    entities: list[KarakeepStatSensor] = []
-    for key, (name, icon, unit) in STATS.items():
-        _LOGGER.debug(
-            "Creating KarakeepStatSensor for stat: %s with name: %s",
-            key,
-            name,
+    device_info = entry_data["device_info"]
+    async_add_entities(
+        KarakeepStatSensor(
+            coordinator=coordinator,
+            entry_id=entry.entry_id,
+            device_info=device_info,
+            description=description,
         )
-        entities.append(
-            KarakeepStatSensor(
-                coordinator=coordinator,
-                entry_id=entry.entry_id,
-                key=key,
-                name=name,
-                icon=icon,
-                unit=unit,
-            )
-        )
-
-    _LOGGER.debug("Adding %d Karakeep sensor entities", len(entities))
-    async_add_entities(entities)
-    _LOGGER.debug("Karakeep sensor entities setup completed")
+        for description in ENTITY_DESCRIPTIONS.values()
+    )
+    _LOGGER.debug(
+        "Karakeep sensor entities setup completed (%d stats)",
+        len(ENTITY_DESCRIPTIONS),
+    )
 
 
 class KarakeepStatSensor(CoordinatorEntity, SensorEntity):
@@ -70,52 +66,38 @@ class KarakeepStatSensor(CoordinatorEntity, SensorEntity):
         self,
         coordinator,
         entry_id: str,
-        key: str,
-        name: str,
-        icon: str,
-        unit: str,
+        device_info: DeviceInfo,
+        description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._key = key
-        self._entry_id = entry_id
-
-        self.entity_description = SensorEntityDescription(
-            key=key,
-            name=name,
-            icon=f"mdi:{icon}",
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=unit,
-        )
+        key = description.key
+        self._attr_device_info = device_info
+        self.entity_description = description
 
         # Unique per config entry and stat key
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{key}"
+        self._update_attrs()
 
         _LOGGER.debug(
             "Initialized KarakeepStatSensor: entry_id=%s key=%s name=%s unique_id=%s",
             entry_id,
             key,
-            name,
+            description.name,
             self._attr_unique_id,
         )
 
-    @property
-    def device_info(self) -> dict:
-        """Return device info to group entities under a service."""
-        return {
-            "identifiers": {(DOMAIN, self._entry_id)},
-            "name": "Karakeep",
-            "manufacturer": "Karakeep",
-            "entry_type": DeviceEntryType.SERVICE,
-        }
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Cache the new value, then write the state."""
+        self._update_attrs()
+        super()._handle_coordinator_update()
 
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        value = self.coordinator.data.get(self._key)
+    def _update_attrs(self) -> None:
+        """Compute the state from the latest coordinator data."""
+        self._attr_native_value = self.coordinator.data[self.entity_description.key]
         _LOGGER.debug(
-            "Getting native value for sensor %s: %s",
+            "Updated native value for sensor %s: %s",
             self._attr_unique_id,
-            value,
+            self._attr_native_value,
         )
-        return value